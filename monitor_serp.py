@@ -7,7 +7,7 @@ site-type classification, and contact extraction.
 Features:
 - Docker-friendly; can run as a long-lived service
 - Built-in scheduler (cron-style via SCHEDULE_CRON or interval via RUN_EVERY_SECONDS)
-- Concurrency for enrichment (ThreadPool) and pooled HTTP sessions
+- Concurrency for enrichment (asyncio + aiohttp) and a pooled HTTP session
 - Config via env vars
 - CSV exports + optional Google Sheets sync
 - Pluggable SERP providers: serper.dev (primary) and SerpAPI (fallback)
@@ -24,17 +24,18 @@ import json
 import time
 import signal
 import argparse
+import asyncio
+import functools
 import sqlite3
+import threading
 import datetime as dt
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from urllib.parse import urlparse, urljoin
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
+import aiohttp
+import ahocorasick
+from selectolax.lexbor import LexborHTMLParser
 import tldextract
 # Optional Google Sheets sync
 try:
@@ -45,12 +46,19 @@ try:
 except Exception as e:
     logging.error(e)
     HAS_GSHEETS = False
+# Optional Hyperscan (SIMD multi-pattern scanner) for site-type scoring; Aho-Corasick otherwise
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except Exception:
+    HAS_HYPERSCAN = False
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s", filename="logs/serp_monitor.log")
 
 # ----------------------------- Configuration ----------------------------- #
 DB_PATH = os.getenv("DB_PATH", "serp.db")
 EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+TLD_CACHE_DIR = os.getenv("TLD_CACHE_DIR", ".tld_cache")  # public suffix list cache
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 
 # Scheduling: choose either CRON or INTERVAL (seconds)
@@ -70,20 +78,52 @@ TOP_N_DEFAULT = int(os.getenv("TOP_N", "30"))
 # HTTP
 USER_AGENT = os.getenv("HTTP_USER_AGENT", "Mozilla/5.0 (SERP-Monitor/2.0)")
 HTTP_TIMEOUT = int(os.getenv("HTTP_TIMEOUT", "20"))
-HTTP_DELAY = float(os.getenv("HTTP_DELAY", "0.2"))
+HTTP_DELAY = float(os.getenv("HTTP_DELAY", "0.2"))  # min spacing between calls to one SERP provider
+SERP_CONCURRENCY = int(os.getenv("SERP_CONCURRENCY", "16"))  # keywords queried in parallel
 MAX_CONTACT_PAGES = int(os.getenv("MAX_CONTACT_PAGES", "3"))
+MAX_HTML_BYTES = int(os.getenv("MAX_HTML_BYTES", "2000000"))  # pages are truncated past this
 MAX_WORKERS = int(os.getenv("MAX_WORKERS", "8"))  # enrichment concurrency
+HTTP_POOL_SIZE = MAX_WORKERS * 4  # domains enriched at once == pooled connections
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def _build_session(limit: int = HTTP_POOL_SIZE, limit_per_host: int = 4) -> aiohttp.ClientSession:
+    """Shared session for a run; must be created inside the running event loop."""
+    # Requests past the limit wait for a pooled connection instead of opening new ones.
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers={"User-Agent": USER_AGENT})
+
+async def _request(session: aiohttp.ClientSession, method: str, url: str, retries: int = 3,
+                   backoff_factor: float = 0.3, **kwargs) -> aiohttp.ClientResponse:
+    """session.request() with retries on connection errors and RETRY_STATUSES."""
+    for attempt in range(retries + 1):
+        try:
+            resp = await session.request(method, url, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+        else:
+            if resp.status not in RETRY_STATUSES or attempt == retries:
+                return resp
+            resp.release()
+        await asyncio.sleep(backoff_factor * (2 ** attempt))
+
+class Throttle:
+    """Spaces calls at least `interval` seconds apart across all concurrent tasks."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = 0.0
 
-SESSION: Optional[requests.Session] = None
+    async def wait(self) -> None:
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
-def _build_session() -> requests.Session:
-    s = requests.Session()
-    s.headers.update({"User-Agent": USER_AGENT})
-    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retries, pool_connections=100, pool_maxsize=100)
-    s.mount("http://", adapter)
-    s.mount("https://", adapter)
-    return s
+SERP_THROTTLE = {"serper": Throttle(HTTP_DELAY), "serpapi": Throttle(HTTP_DELAY)}
 
 # Patterns
 EMAIL_REGEX = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
@@ -91,6 +131,8 @@ CONTACT_LINK_HINTS = [
     "contact", "contacts", "contact-us", "support", "feedback", "about", "about-us",
     "kontakt", "kontakty", "impressum", "контакт", "контакти", "про-нас", "о-нас"
 ]
+CONTACT_REGEX = re.compile("|".join(map(re.escape, CONTACT_LINK_HINTS)), re.I)
+SOCIAL_REGEX = re.compile(r"(?:facebook|instagram|linkedin|twitter|youtube)\.com|t\.me|x\.com", re.I)
 SITE_TYPE_HINTS = {
     "product": ["add to cart", "buy now", "checkout", "/product/", "/products/", "schema.org/Product", "товар"],
     "review": ["review", "reviews", "rating", "рейтинг", "обзор", "порівняння", "best"],
@@ -98,11 +140,40 @@ SITE_TYPE_HINTS = {
     "blog": ["blog", "/blog/", "BlogPosting", "schema.org/Article"],
 }
 
+SITE_TYPES = list(SITE_TYPE_HINTS)
+
+def _build_automaton(words: List[Tuple[str, Any]]) -> ahocorasick.Automaton:
+    # Inputs are lowercased before scanning, so hints are too.
+    ac = ahocorasick.Automaton()
+    for word, value in words:
+        ac.add_word(word.lower(), value)
+    ac.make_automaton()
+    return ac
+
+# Flattened (site type index, lowercased hint); a hint's id is its index here
+SITE_HINTS = [(cls, h.lower()) for cls, kind in enumerate(SITE_TYPES) for h in SITE_TYPE_HINTS[kind]]
+
+def _build_hyperscan_db() -> "hyperscan.Database":
+    hs_db = hyperscan.Database()
+    hs_db.compile(
+        expressions=[re.escape(h).encode("utf-8") for _, h in SITE_HINTS],
+        ids=list(range(len(SITE_HINTS))),
+        elements=len(SITE_HINTS),
+        # SINGLEMATCH: report each hint once per scan, which is all the scoring needs
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(SITE_HINTS),
+    )
+    return hs_db
+
+# One sweep over a text finds the hints of every class at once
+HS_SITE = _build_hyperscan_db() if HAS_HYPERSCAN else None
+AC_SITE = _build_automaton([(h, i) for i, (_, h) in enumerate(SITE_HINTS)])
+
 @dataclass
 class SERPItem:
     position: int
     title: str
     url: str
+    normalized_url: str  # scheme://netloc/path from split_url(), stored in serp_snapshot
     domain: str
     snippet: str = ""
 
@@ -119,27 +190,39 @@ def ensure_dirs():
 def today_str() -> str:
     return dt.date.today().isoformat()
 
-def extract_domain(url: str) -> str:
+_TLD = tldextract.TLDExtract(cache_dir=TLD_CACHE_DIR, include_psl_private_domains=False)
+
+@functools.lru_cache(maxsize=100_000)
+def _registered_domain(netloc: str) -> str:
     try:
-        ext = tldextract.extract(url)
+        ext = _TLD(netloc)
         return ".".join(p for p in [ext.domain, ext.suffix] if p)
     except Exception:
-        return urlparse(url).netloc
+        return netloc
 
-def normalize_url(url: str) -> str:
+def split_url(url: str) -> Tuple[str, str]:
+    """Return (normalized url, domain) from a single urlparse() of url."""
     try:
         p = urlparse(url)
-        scheme = p.scheme or "https"
-        netloc = (p.netloc or '').lower()
-        path = p.path or "/"
-        return f"{scheme}://{netloc}{path}"
-    except Exception:
-        return url
+    except ValueError:
+        return url, _registered_domain(url)
+    scheme = p.scheme or "https"
+    netloc = (p.netloc or '').lower()
+    path = p.path or "/"
+    # Domain lookup is memoized per netloc: SERP results repeat the same hosts across keywords.
+    return f"{scheme}://{netloc}{path}", _registered_domain(p.netloc or url)
 
 # ----------------------------- DB Layer ----------------------------- #
 def db() -> sqlite3.Connection:
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    # Only journal_mode persists in the file; the rest is per-connection.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA busy_timeout=5000")
     return conn
 
 def init_db() -> None:
@@ -147,7 +230,6 @@ def init_db() -> None:
         cur = conn.cursor()
         cur.executescript(
             """
-            PRAGMA journal_mode=WAL;
             CREATE TABLE IF NOT EXISTS serp_snapshot (
               id INTEGER PRIMARY KEY,
               snapshot_date TEXT NOT NULL,
@@ -176,79 +258,90 @@ def init_db() -> None:
               last_seen TEXT NOT NULL,
               PRIMARY KEY(keyword, domain)
             );
+            CREATE INDEX IF NOT EXISTS idx_snapshot_date ON serp_snapshot(snapshot_date, keyword, domain);
             """
         )
+        # Refresh planner stats every cycle; analysis_limit makes ANALYZE sample each index
+        # instead of scanning it, so the cost doesn't grow with history.
+        cur.execute("PRAGMA analysis_limit=400")
+        cur.execute("ANALYZE")
         conn.commit()
 
-def upsert_snapshot(date_s: str, keyword: str, items: List[SERPItem]) -> None:
-    with db() as conn:
-        cur = conn.cursor()
-        for it in items:
-            cur.execute(
-                """
-                INSERT OR IGNORE INTO serp_snapshot
-                (snapshot_date, keyword, position, url, title, domain, snippet)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (date_s, keyword, it.position, normalize_url(it.url), it.title, it.domain, it.snippet)
-            )
-            cur.execute("SELECT 1 FROM keyword_domain WHERE keyword=? AND domain=?", (keyword, it.domain))
-            if not cur.fetchone():
-                cur.execute(
-                    "INSERT INTO keyword_domain(keyword, domain, first_seen, last_seen) VALUES (?, ?, ?, ?)",
-                    (keyword, it.domain, date_s, date_s)
-                )
-            else:
-                cur.execute(
-                    "UPDATE keyword_domain SET last_seen=? WHERE keyword=? AND domain=?",
-                    (date_s, keyword, it.domain)
-                )
-        conn.commit()
-
-def mark_domain_seen(domain: str, homepage: Optional[str], date_s: str) -> None:
+def upsert_snapshot(date_s: str, serps: Dict[str, List[SERPItem]]) -> None:
+    """Write the SERP items of all keywords (keyword -> items) in one transaction."""
+    snap_rows = [
+        (date_s, keyword, it.position, it.normalized_url, it.title, it.domain, it.snippet)
+        for keyword, items in serps.items() for it in items
+    ]
+    kd_rows = [(keyword, it.domain, date_s, date_s) for keyword, items in serps.items() for it in items]
     with db() as conn:
         cur = conn.cursor()
-        cur.execute("SELECT domain FROM domain_status WHERE domain=?", (domain,))
-        if cur.fetchone():
-            cur.execute("UPDATE domain_status SET last_seen=?, homepage=COALESCE(homepage, ?) WHERE domain=?",
-                        (date_s, homepage, domain))
-        else:
-            cur.execute("INSERT INTO domain_status(domain, homepage, first_seen, last_seen) VALUES (?, ?, ?, ?)",
-                        (domain, homepage, date_s, date_s))
+        cur.executemany(
+            """
+            INSERT OR IGNORE INTO serp_snapshot
+            (snapshot_date, keyword, position, url, title, domain, snippet)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            snap_rows
+        )
+        # Requires SQLite >= 3.24 (UPSERT)
+        cur.executemany(
+            """
+            INSERT INTO keyword_domain(keyword, domain, first_seen, last_seen) VALUES (?, ?, ?, ?)
+            ON CONFLICT(keyword, domain) DO UPDATE SET last_seen=excluded.last_seen
+            """,
+            kd_rows
+        )
         conn.commit()
 
-def update_domain_info(domain: str, site_type: Optional[str], contacts: Dict[str, Any]) -> None:
+CONTACT_KEYS = ["emails", "phones", "socials", "contact_pages"]
+
+# Per contact key: sorted union of the stored and the new JSON arrays (bad stored JSON counts as empty).
+_PREV_CONTACTS = "CASE WHEN json_valid(domain_status.contacts_json) THEN domain_status.contacts_json ELSE '{}' END"
+_MERGED_CONTACTS = "json_object(" + ", ".join(
+    f"'{k}', (SELECT json_group_array(value) FROM ("
+    f"SELECT value FROM json_each({_PREV_CONTACTS}, '$.{k}') UNION "
+    f"SELECT value FROM json_each(excluded.contacts_json, '$.{k}') ORDER BY value))"
+    for k in CONTACT_KEYS
+) + ")"
+
+def save_domain_results(date_s: str, results: List[Tuple[str, str, Optional[str], Dict[str, Any]]]) -> None:
+    """Upsert enrichment results (domain, homepage, site_type, contacts) in one transaction."""
+    rows = [
+        (domain, homepage, date_s, date_s, site_type, json.dumps(contacts, ensure_ascii=False))
+        for domain, homepage, site_type, contacts in results
+    ]
     with db() as conn:
         cur = conn.cursor()
-        cur.execute("SELECT contacts_json FROM domain_status WHERE domain=?", (domain,))
-        row = cur.fetchone()
-        merged = contacts
-        if row and row["contacts_json"]:
-            try:
-                prev = json.loads(row["contacts_json"]) or {}
-            except Exception:
-                prev = {}
-            for k in ["emails", "phones", "socials", "contact_pages"]:
-                merged[k] = sorted(set((prev.get(k) or []) + (contacts.get(k) or [])))
-        cur.execute(
-            "UPDATE domain_status SET site_type=COALESCE(?, site_type), contacts_json=? WHERE domain=?",
-            (site_type, json.dumps(merged, ensure_ascii=False), domain)
+        cur.executemany(
+            f"""
+            INSERT INTO domain_status(domain, homepage, first_seen, last_seen, site_type, contacts_json)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(domain) DO UPDATE SET
+              last_seen=excluded.last_seen,
+              homepage=COALESCE(domain_status.homepage, excluded.homepage),
+              site_type=COALESCE(excluded.site_type, domain_status.site_type),
+              contacts_json=CASE WHEN COALESCE(domain_status.contacts_json, '') = '' THEN excluded.contacts_json
+                                 ELSE {_MERGED_CONTACTS} END
+            """,
+            rows
         )
         conn.commit()
 
 # ----------------------------- SERP Providers ----------------------------- #
-def search_serper(session: requests.Session, keyword: str, num: int = 30, gl: str = GL_DEFAULT, hl: str = HL_DEFAULT) -> List[Dict[str, Any]]:
+async def search_serper(session: aiohttp.ClientSession, keyword: str, num: int = 30, gl: str = GL_DEFAULT, hl: str = HL_DEFAULT) -> List[Dict[str, Any]]:
     if not SERPER_API_KEY:
         raise RuntimeError("SERPER_API_KEY not set")
     endpoint = "https://google.serper.dev/search"
     headers = {"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"}
     payload = {"q": keyword, "num": min(num, 100), "gl": gl, "hl": hl}
-    resp = session.post(endpoint, headers=headers, json=payload, timeout=HTTP_TIMEOUT)
-    resp.raise_for_status()
-    data = resp.json()
+    await SERP_THROTTLE["serper"].wait()
+    async with await _request(session, "POST", endpoint, headers=headers, json=payload) as resp:
+        resp.raise_for_status()
+        data = await resp.json(content_type=None)
     return data.get("organic", [])[:num]
 
-def search_serpapi(session: requests.Session, keyword: str, num: int = 30, gl: str = GL_DEFAULT, hl: str = HL_DEFAULT) -> List[Dict[str, Any]]:
+async def search_serpapi(session: aiohttp.ClientSession, keyword: str, num: int = 30, gl: str = GL_DEFAULT, hl: str = HL_DEFAULT) -> List[Dict[str, Any]]:
     if not SERPAPI_API_KEY:
         return []
     params = {
@@ -259,21 +352,22 @@ def search_serpapi(session: requests.Session, keyword: str, num: int = 30, gl: s
         "hl": hl,
         "gl": gl,
     }
-    resp = session.get("https://serpapi.com/search", params=params, timeout=HTTP_TIMEOUT)
-    resp.raise_for_status()
-    data = resp.json()
+    await SERP_THROTTLE["serpapi"].wait()
+    async with await _request(session, "GET", "https://serpapi.com/search", params=params) as resp:
+        resp.raise_for_status()
+        data = await resp.json(content_type=None)
     org = data.get("organic_results", [])
     out = []
     for r in org[:num]:
         out.append({"title": r.get("title"), "link": r.get("link"), "snippet": r.get("snippet"), "position": r.get("position")})
     return out
 
-def get_serp(session: requests.Session, keyword: str, num: int = TOP_N_DEFAULT, gl: str = GL_DEFAULT, hl: str = HL_DEFAULT) -> List[SERPItem]:
+async def get_serp(session: aiohttp.ClientSession, keyword: str, num: int = TOP_N_DEFAULT, gl: str = GL_DEFAULT, hl: str = HL_DEFAULT) -> List[SERPItem]:
     try:
-        raw = search_serper(session, keyword, num=num, gl=gl, hl=hl)
+        raw = await search_serper(session, keyword, num=num, gl=gl, hl=hl)
     except Exception as e:
         log("WARN", f"serper failed: {e}; trying serpapi")
-        raw = search_serpapi(session, keyword, num=num, gl=gl, hl=hl)
+        raw = await search_serpapi(session, keyword, num=num, gl=gl, hl=hl)
 
     items: List[SERPItem] = []
     for i, r in enumerate(raw, start=1):
@@ -282,19 +376,31 @@ def get_serp(session: requests.Session, keyword: str, num: int = TOP_N_DEFAULT,
         snip = r.get("snippet") or ""
         if not url:
             continue
-        items.append(SERPItem(position=i, title=title, url=url, domain=extract_domain(url), snippet=snip))
+        normalized, domain = split_url(url)
+        items.append(SERPItem(position=i, title=title, url=url, normalized_url=normalized, domain=domain, snippet=snip))
     return items
 
 # ----------------------------- Classification & Contacts ----------------------------- #
-def fetch_html(session: requests.Session, url: str) -> Tuple[str, Optional[str]]:
+async def fetch_html(session: aiohttp.ClientSession, url: str) -> Tuple[str, Optional[str]]:
     try:
-        resp = session.get(url, timeout=HTTP_TIMEOUT, allow_redirects=True)
-        ct = resp.headers.get("content-type", "")
-        if resp.status_code >= 400:
-            return "", None
-        if "text/html" not in ct and "application/xhtml" not in ct:
-            return "", None
-        return resp.text, resp.url
+        async with await _request(session, "GET", url, allow_redirects=True) as resp:
+            ct = resp.headers.get("content-type", "")
+            if resp.status >= 400:
+                return "", None
+            if "text/html" not in ct and "application/xhtml" not in ct:
+                resp.close()  # don't download bodies we would discard
+                return "", None
+            body = bytearray()
+            async for chunk in resp.content.iter_chunked(64 * 1024):
+                body += chunk
+                if len(body) >= MAX_HTML_BYTES:
+                    del body[MAX_HTML_BYTES:]
+                    resp.close()
+                    break
+            try:
+                return body.decode(resp.charset or "utf-8", errors="replace"), str(resp.url)
+            except LookupError:
+                return body.decode("utf-8", errors="replace"), str(resp.url)
     except Exception:
         return "", None
 
@@ -302,23 +408,38 @@ def guess_site_type(title: str, html: str, url: str) -> Optional[str]:
     title_l = (title or "").lower()
     html_l = (html or "").lower()
     url_l = (url or "").lower()
-    scores = {k: 0 for k in SITE_TYPE_HINTS}
-    for kind, hints in SITE_TYPE_HINTS.items():
-        for h in hints:
-            if h in html_l or h in title_l or h in url_l:
-                scores[kind] += 1
-    chosen = max(scores, key=lambda k: scores[k])
-    return chosen if scores[chosen] > 0 else None
-
-def extract_contacts_from_html(html: str) -> Dict[str, List[str]]:
+    # Each hint counts once, whichever of title/html/url it appears in.
+    # Text is still lowercased up front: HS_FLAG_CASELESS only folds ASCII, not Cyrillic.
+    hits = set()
+    if HS_SITE is not None:
+        def on_match(hint_id, start, end, flags, context):
+            hits.add(hint_id)
+        for text in (html_l, title_l, url_l):
+            HS_SITE.scan(text.encode("utf-8"), match_event_handler=on_match)
+    else:
+        for text in (html_l, title_l, url_l):
+            hits.update(i for _, i in AC_SITE.iter(text))
+    scores = [0] * len(SITE_TYPES)
+    for hint_id in hits:
+        scores[SITE_HINTS[hint_id][0]] += 1
+    chosen = max(range(len(SITE_TYPES)), key=lambda i: scores[i])
+    return SITE_TYPES[chosen] if scores[chosen] > 0 else None
+
+def parse_html(html: str) -> Optional[LexborHTMLParser]:
+    try:
+        return LexborHTMLParser(html)
+    except Exception:
+        return None
+
+def extract_contacts_from_tree(html: str, tree: Optional[LexborHTMLParser]) -> Dict[str, List[str]]:
+    # Emails are matched on the raw HTML so inline text is covered too.
     emails = set(EMAIL_REGEX.findall(html))
     phones = set()  # optional: add phone regex if needed
     socials = set()
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        for a in soup.find_all("a", href=True):
-            href = a["href"].strip()
-            if any(s in href for s in ["facebook.com", "instagram.com", "linkedin.com", "x.com", "twitter.com", "t.me", "youtube.com"]):
+        for a in (tree.css("a[href]") if tree else []):
+            href = (a.attributes.get("href") or "").strip()
+            if SOCIAL_REGEX.search(href):
                 socials.add(href)
             if href.startswith("mailto:"):
                 emails.add(href[7:])
@@ -326,17 +447,19 @@ def extract_contacts_from_html(html: str) -> Dict[str, List[str]]:
         pass
     return {"emails": sorted(emails), "phones": sorted(phones), "socials": sorted(socials)}
 
-def find_contact_pages(base_url: str, html: str) -> List[str]:
+def find_contact_pages_from_tree(base_url: str, tree: Optional[LexborHTMLParser]) -> List[str]:
     pages = []
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        for a in soup.find_all("a", href=True):
-            href = a["href"].strip()
-            text = (a.get_text() or "").lower()
-            if any(h in href.lower() for h in CONTACT_LINK_HINTS) or any(h in text for h in CONTACT_LINK_HINTS):
+        for a in (tree.css("a[href]") if tree else []):
+            href = (a.attributes.get("href") or "").strip()
+            text = a.text(deep=True, strip=True)
+            if CONTACT_REGEX.search(href) or CONTACT_REGEX.search(text):
                 pages.append(urljoin(base_url, href))
     except Exception:
         pass
+    # Discovered links with "contact" in the path go first (stable sort keeps discovery
+    # order otherwise); only then the guessed defaults, as a fallback.
+    pages.sort(key=lambda u: "contact" not in urlparse(u).path.lower())
     try:
         p = urlparse(base_url)
         base = f"{p.scheme}://{p.netloc}"
@@ -351,67 +474,81 @@ def find_contact_pages(base_url: str, html: str) -> List[str]:
             uniq.append(u)
     return uniq[:MAX_CONTACT_PAGES]
 
-def enrich_one(domain: str, homepage_hint: Optional[str]) -> Tuple[str, Optional[str], Dict[str, Any]]:
+def has_enough_contacts(contacts: Dict[str, List[str]]) -> bool:
+    return len(contacts.get("emails", [])) >= 1 and len(contacts.get("socials", [])) >= 2
+
+async def enrich_one(session: aiohttp.ClientSession, domain: str, homepage_hint: Optional[str]) -> Tuple[str, Optional[str], Dict[str, Any]]:
     """Return (homepage, site_type, contacts) for a domain"""
-    session = SESSION or _build_session()
     homepage = homepage_hint or f"https://{domain}/"
-    html, final_url = fetch_html(session, homepage)
+    html, final_url = await fetch_html(session, homepage)
     if not html and homepage.startswith("https://"):
-        html, final_url = fetch_html(session, "http://" + domain + "/")
+        html, final_url = await fetch_html(session, "http://" + domain + "/")
     if final_url:
         homepage = final_url
     site_type = guess_site_type("", html, homepage)
-    contacts = extract_contacts_from_html(html)
-    contact_pages = find_contact_pages(homepage, html)
-    for u in contact_pages:
-        p_html, _ = fetch_html(session, u)
-        if not p_html:
-            continue
-        extra = extract_contacts_from_html(p_html)
-        for k in ["emails", "phones", "socials"]:
-            contacts[k] = sorted(set(contacts.get(k, []) + extra.get(k, [])))
+    tree = parse_html(html)
+    contacts = extract_contacts_from_tree(html, tree)
+    contact_pages = find_contact_pages_from_tree(homepage, tree)
+    if not has_enough_contacts(contacts):
+        # Contact pages are independent, so fetch them in one concurrent round.
+        pages = await asyncio.gather(*[fetch_html(session, u) for u in contact_pages])
+        for p_html, _ in pages:
+            if not p_html:
+                continue
+            extra = extract_contacts_from_tree(p_html, parse_html(p_html))
+            for k in ["emails", "phones", "socials"]:
+                contacts[k] = sorted(set(contacts.get(k, []) + extra.get(k, [])))
     contacts["contact_pages"] = contact_pages
     return homepage, site_type, contacts
 
 # ----------------------------- Exporters ----------------------------- #
+# One row per snapshot entry with is_new_domain resolved by the join (no per-row lookups)
+SNAPSHOT_EXPORT_SQL = """
+    SELECT s.snapshot_date, s.keyword, s.position, s.url, s.title, s.domain, s.snippet,
+           s.position <= 10 AS is_top10,
+           s.position <= 30 AS is_top30,
+           CASE WHEN kd.first_seen = s.snapshot_date THEN 1 ELSE 0 END AS is_new_domain
+    FROM serp_snapshot s
+    LEFT JOIN keyword_domain kd ON kd.keyword = s.keyword AND kd.domain = s.domain
+    WHERE s.snapshot_date=?
+    ORDER BY s.keyword, s.position
+"""
+DOMAINS_EXPORT_SQL = "SELECT domain, homepage, first_seen, last_seen, site_type, contacts_json FROM domain_status"
+SNAPSHOT_HEADER = ["date", "keyword", "position", "url", "title", "domain", "snippet", "is_top10", "is_top30", "is_new_domain"]
+DOMAINS_HEADER = ["domain", "homepage", "first_seen", "last_seen", "site_type", "emails", "phones", "socials", "contact_pages"]
+
+def _domain_row(r: sqlite3.Row) -> List[Any]:
+    """Flatten a domain_status row; contact lists are joined with ';'."""
+    contacts = json.loads(r["contacts_json"]) if r["contacts_json"] else {}
+    return [r["domain"], r["homepage"], r["first_seen"], r["last_seen"], r["site_type"] or ""] + [
+        ";".join(contacts.get(k, [])) for k in CONTACT_KEYS
+    ]
+
+def _build_snapshot_rows(date_s: str) -> Iterator[List[Any]]:
+    """Snapshot rows for date_s, streamed from the cursor (shared by CSV and Sheets)."""
+    with db() as conn:
+        for r in conn.execute(SNAPSHOT_EXPORT_SQL, (date_s,)):
+            yield list(r)
+
+def _build_domain_rows() -> Iterator[List[Any]]:
+    with db() as conn:
+        for r in conn.execute(DOMAINS_EXPORT_SQL):
+            yield _domain_row(r)
+
 def export_latest(date_s: Optional[str] = None) -> Tuple[str, str]:
     ensure_dirs()
     if date_s in (None, "today"):
         date_s = today_str()
     snap_csv = os.path.join(EXPORT_DIR, f"snapshot_{date_s}.csv")
     domains_csv = os.path.join(EXPORT_DIR, f"domains_{date_s}.csv")
-    with db() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT snapshot_date, keyword, position, url, title, domain, snippet FROM serp_snapshot WHERE snapshot_date=? ORDER BY keyword, position",
-            (date_s,)
-        )
-        rows = cur.fetchall()
-        with open(snap_csv, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["date", "keyword", "position", "url", "title", "domain", "snippet", "is_top10", "is_top30", "is_new_domain"])
-            for r in rows:
-                pos = int(r["position"])
-                is_top10 = pos <= 10
-                is_top30 = pos <= 30
-                cur.execute("SELECT first_seen FROM keyword_domain WHERE keyword=? AND domain=?", (r["keyword"], r["domain"]))
-                kd = cur.fetchone()
-                is_new = kd and kd[0] == date_s
-                w.writerow([r["snapshot_date"], r["keyword"], pos, r["url"], r["title"], r["domain"], r["snippet"], int(is_top10), int(is_top30), int(bool(is_new))])
-        cur.execute("SELECT domain, homepage, first_seen, last_seen, site_type, contacts_json FROM domain_status")
-        rows = cur.fetchall()
-        with open(domains_csv, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["domain", "homepage", "first_seen", "last_seen", "site_type", "emails", "phones", "socials", "contact_pages"])
-            for r in rows:
-                contacts = json.loads(r["contacts_json"]) if r["contacts_json"] else {}
-                w.writerow([
-                    r["domain"], r["homepage"], r["first_seen"], r["last_seen"], r["site_type"] or "",
-                    ";".join(contacts.get("emails", [])),
-                    ";".join(contacts.get("phones", [])),
-                    ";".join(contacts.get("socials", [])),
-                    ";".join(contacts.get("contact_pages", [])),
-                ])
+    with open(snap_csv, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(SNAPSHOT_HEADER)
+        w.writerows(_build_snapshot_rows(date_s))
+    with open(domains_csv, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(DOMAINS_HEADER)
+        w.writerows(_build_domain_rows())
     return snap_csv, domains_csv
 
 # ----------------------------- Google Sheets (optional) ----------------------------- #
@@ -440,59 +577,24 @@ def gsheets_push(date_s: str, spreadsheet_name: str = "SERP Monitor") -> None:
         return
 
     try:
-        # --- Snapshot sheet (за датою)
-        try:
-            ws1 = sh.worksheet(date_s)
-            ws1.clear()
-        except Exception:
-            ws1 = sh.add_worksheet(title=date_s, rows="1000", cols="10")
-
-        with db() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT snapshot_date, keyword, position, url, title, domain, snippet "
-                "FROM serp_snapshot WHERE snapshot_date=? ORDER BY keyword, position",
-                (date_s,)
-            )
-            rows = cur.fetchall()
-            data = [["date", "keyword", "position", "url", "title", "domain", "snippet",
-                     "is_top10", "is_top30", "is_new_domain"]]
-            for r in rows:
-                pos = int(r["position"])
-                is_top10 = pos <= 10
-                is_top30 = pos <= 30
-                cur.execute("SELECT first_seen FROM keyword_domain WHERE keyword=? AND domain=?",
-                            (r["keyword"], r["domain"]))
-                kd = cur.fetchone()
-                is_new = kd and kd[0] == date_s
-                data.append([r["snapshot_date"], r["keyword"], pos, r["url"], r["title"],
-                             r["domain"], r["snippet"], int(is_top10), int(is_top30), int(bool(is_new))])
-        ws1.update(range_name="A1", values=data)
-
-
-        # --- Domains sheet
-        try:
-            ws2 = sh.worksheet("domains")
-            ws2.clear()
-        except Exception:
-            ws2 = sh.add_worksheet(title="domains", rows="1000", cols="10")
-
-        with db() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT domain, homepage, first_seen, last_seen, site_type, contacts_json FROM domain_status")
-            rows = cur.fetchall()
-            data = [["domain", "homepage", "first_seen", "last_seen", "site_type",
-                     "emails", "phones", "socials", "contact_pages"]]
-            for r in rows:
-                contacts = json.loads(r["contacts_json"]) if r["contacts_json"] else {}
-                data.append([
-                    r["domain"], r["homepage"], r["first_seen"], r["last_seen"], r["site_type"] or "",
-                    ";".join(contacts.get("emails", [])),
-                    ";".join(contacts.get("phones", [])),
-                    ";".join(contacts.get("socials", [])),
-                    ";".join(contacts.get("contact_pages", [])),
-                ])
-        ws2.update(range_name="A1", values=data)
+        # --- Snapshot sheet (за датою) + domains sheet, written in one values:batchUpdate call
+        to_clear = []
+        for title in (date_s, "domains"):
+            try:
+                sh.worksheet(title)
+                to_clear.append(f"'{title}'")
+            except Exception:
+                sh.add_worksheet(title=title, rows="1000", cols="10")
+        if to_clear:
+            sh.values_batch_clear(body={"ranges": to_clear})
+
+        sh.values_batch_update({
+            "valueInputOption": "RAW",
+            "data": [
+                {"range": f"'{date_s}'!A1", "values": [SNAPSHOT_HEADER] + list(_build_snapshot_rows(date_s))},
+                {"range": "'domains'!A1", "values": [DOMAINS_HEADER] + list(_build_domain_rows())},
+            ],
+        })
 
         log("INFO", "Sheets updated successfully.")
     except APIError as e:
@@ -510,39 +612,57 @@ def load_keywords(path: str) -> List[str]:
         log("WARN", f"keywords file not found: {path}")
         return []
 
+async def _collect(date_s: str, keywords: List[str], top_n: int, gl: str, hl: str) -> None:
+    # SERP calls all hit one provider host, so they get their own pool sized to
+    # SERP_CONCURRENCY instead of the per-host cap meant for crawling sites.
+    serp_pool = max(1, SERP_CONCURRENCY)
+    async with _build_session(limit=serp_pool, limit_per_host=serp_pool) as serp_session, \
+            _build_session() as session:
+        # 1) Fetch SERPs for all keywords concurrently, then store them in one batch
+        serp_sem = asyncio.Semaphore(max(1, min(SERP_CONCURRENCY, len(keywords))))
+
+        async def query(kw: str) -> List[SERPItem]:
+            async with serp_sem:
+                log("INFO", f"Query: {kw}")
+                return await get_serp(serp_session, kw, num=top_n, gl=gl, hl=hl)
+
+        results = await asyncio.gather(*[query(kw) for kw in keywords], return_exceptions=True)
+        serps = {}
+        for kw, res in zip(keywords, results):
+            if isinstance(res, BaseException):
+                log("WARN", f"SERP fetch failed for {kw}: {res}")
+                continue
+            serps[kw] = res
+        upsert_snapshot(date_s, serps)
+
+        # 2) Enrich unique domains concurrently, bounded by a semaphore
+        with db() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT DISTINCT domain FROM serp_snapshot WHERE snapshot_date=?", (date_s,))
+            domains = [r[0] for r in cur.fetchall()]
+
+        sem = asyncio.Semaphore(HTTP_POOL_SIZE)
+
+        async def bounded(d: str):
+            async with sem:
+                return await enrich_one(session, d, f"https://{d}/")
+
+        results = await asyncio.gather(*[bounded(d) for d in domains], return_exceptions=True)
+        enriched = []
+        for d, res in zip(domains, results):
+            if isinstance(res, BaseException):
+                log("WARN", f"enrich failed for {d}: {res}")
+                continue
+            homepage, site_type, contacts = res
+            enriched.append((d, homepage, site_type, contacts))
+        save_domain_results(date_s, enriched)
+
 def run_once(keywords: List[str], top_n: int, gl: str, hl: str) -> None:
-    global SESSION
     ensure_dirs()
     init_db()
-    SESSION = SESSION or _build_session()
     date_s = today_str()
 
-    # 1) Fetch SERPs per keyword
-    for kw in keywords:
-        log("INFO", f"Query: {kw}")
-        items = get_serp(SESSION, kw, num=top_n, gl=gl, hl=hl)
-        upsert_snapshot(date_s, kw, items)
-        time.sleep(HTTP_DELAY)
-
-    # 2) Enrich unique domains using thread pool
-    with db() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT DISTINCT domain FROM serp_snapshot WHERE snapshot_date=?", (date_s,))
-        domains = [r[0] for r in cur.fetchall()]
-
-    tasks = {}
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
-        for d in domains:
-            homepage_hint = f"https://{d}/"
-            tasks[ex.submit(enrich_one, d, homepage_hint)] = d
-        for fut in as_completed(tasks):
-            d = tasks[fut]
-            try:
-                homepage, site_type, contacts = fut.result()
-                mark_domain_seen(d, homepage, date_s)
-                update_domain_info(d, site_type, contacts)
-            except Exception as e:
-                log("WARN", f"enrich failed for {d}: {e}")
+    asyncio.run(_collect(date_s, keywords, top_n, gl, hl))
 
     snap_csv, domains_csv = export_latest(date_s)
     log("INFO", f"Exported: {snap_csv} and {domains_csv}")
@@ -551,12 +671,11 @@ def run_once(keywords: List[str], top_n: int, gl: str, hl: str) -> None:
         gsheets_push(date_s, spreadsheet_name=os.getenv("SHEETS_NAME", "SERP Monitor"))
 
 # ----------------------------- Scheduler/Daemon ----------------------------- #
-_stop_flag = False
+_stop_event = threading.Event()
 
 def _handle_signal(signum, frame):
-    global _stop_flag
     log("INFO", f"Signal {signum} received, stopping after current cycle...")
-    _stop_flag = True
+    _stop_event.set()
 
 signal.signal(signal.SIGTERM, _handle_signal)
 signal.signal(signal.SIGINT, _handle_signal)
@@ -573,34 +692,29 @@ def serve_loop():
         import croniter
         base = dt.datetime.now()
         itr = croniter.croniter(SCHEDULE_CRON, base)
-        while not _stop_flag:
+        while not _stop_event.is_set():
             next_run = itr.get_next(dt.datetime)
             wait = max(0, (next_run - dt.datetime.now()).total_seconds())
             log("INFO", f"Next run at {next_run.isoformat()} (in {int(wait)}s)")
-            slept = 0
-            while slept < wait and not _stop_flag:
-                step = min(5, wait - slept)
-                time.sleep(step)
-                slept += step
-            if _stop_flag:
+            # Sleeps the whole wait; returns early only when a stop signal sets the event.
+            if _stop_event.wait(timeout=wait):
                 break
             run_once(keywords, TOP_N_DEFAULT, GL_DEFAULT, HL_DEFAULT)
     else:
         interval = max(60, RUN_EVERY_SECONDS)  # at least 1 minute
         log("INFO", f"Interval mode: every {interval}s")
-        while not _stop_flag:
-            start = dt.datetime.now()
+        next_start = time.monotonic()
+        while not _stop_event.is_set():
             run_once(keywords, TOP_N_DEFAULT, GL_DEFAULT, HL_DEFAULT)
-            if _stop_flag:
+            if _stop_event.is_set():
                 break
-            elapsed = (dt.datetime.now() - start).total_seconds()
-            sleep_for = max(0, interval - elapsed)
+            # Schedule from the previous start on the monotonic clock so cycles don't drift.
+            next_start += interval
+            sleep_for = max(0, next_start - time.monotonic())
+            if sleep_for == 0:
+                next_start = time.monotonic()
             log("INFO", f"Sleeping {int(sleep_for)}s")
-            slept = 0
-            while slept < sleep_for and not _stop_flag:
-                step = min(5, sleep_for - slept)
-                time.sleep(step)
-                slept += step
+            _stop_event.wait(timeout=sleep_for)
 
 # ----------------------------- CLI ----------------------------- #
 def build_parser():